@@ -1,7 +1,9 @@
+import os
+import tempfile
 import streamlit as st
 import pandas as pd
 import numpy as np
-from typing import List, Tuple
+from typing import List, NamedTuple, Optional, Tuple
 
 # Configure page
 st.set_page_config(
@@ -11,8 +13,20 @@ st.set_page_config(
 )
 
 # Custom CSS for better styling
-st.markdown("""
+CUSTOM_CSS = """
 <style>
+    .racket-grid {
+        display: grid;
+        grid-template-columns: repeat(3, 1fr);
+        column-gap: 20px;
+    }
+    
+    @media (max-width: 640px) {
+        .racket-grid {
+            grid-template-columns: 1fr;
+        }
+    }
+    
     .racket-card {
         background: white;
         border-radius: 10px;
@@ -75,115 +89,203 @@ st.markdown("""
         margin-bottom: 30px;
     }
 </style>
-""", unsafe_allow_html=True)
+"""
+
+def inject_css():
+    """Emit the custom stylesheet once per full script run"""
+    # Streamlit drops any element not re-emitted during a full rerun, so the CSS
+    # cannot be sent only once per session; fragment reruns skip it instead.
+    st.markdown(CUSTOM_CSS, unsafe_allow_html=True)
+
+PAGE_SIZE = 30
+
+DATA_CSV = 'padel_data.csv'
+DATA_PARQUET = 'padel_data.parquet'
+
+RATING_COLUMNS = ['overall', 'power', 'control', 'rebound', 'omgang', 'sweetspot']
+
+# Ratings fit in 0-100, so narrow dtypes to cut memory traffic on every mask
+COLUMN_DTYPES = {
+    **{col: 'int8' for col in RATING_COLUMNS},
+    'price': 'float32',
+    'name': 'string[pyarrow]',
+}
+
+def _snapshot_matches_schema(df):
+    """Check that a parquet snapshot still has the dtypes the app expects"""
+    return all(
+        col in df.columns and df[col].dtype == pd.api.types.pandas_dtype(dtype)
+        for col, dtype in COLUMN_DTYPES.items()
+    )
+
+def _read_parquet_snapshot():
+    """Read the parquet snapshot, or return None if it is stale, unreadable or outdated"""
+    if not os.path.exists(DATA_PARQUET):
+        return None
+    if os.path.exists(DATA_CSV) and os.path.getmtime(DATA_PARQUET) < os.path.getmtime(DATA_CSV):
+        return None
+    try:
+        df = pd.read_parquet(DATA_PARQUET)
+    except Exception:
+        # A corrupt snapshot must never break the app; the CSV is the source of truth
+        return None
+    return df if _snapshot_matches_schema(df) else None
+
+def _write_parquet_snapshot(df):
+    """Atomically write the parquet snapshot so readers never see a partial file"""
+    tmp_path = None
+    try:
+        fd, tmp_path = tempfile.mkstemp(
+            dir=os.path.dirname(os.path.abspath(DATA_PARQUET)), suffix='.parquet.tmp'
+        )
+        os.close(fd)
+        df.to_parquet(tmp_path, index=False)
+        os.replace(tmp_path, DATA_PARQUET)
+    except Exception:
+        # Snapshots are best-effort, e.g. on read-only deploys
+        if tmp_path and os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+def read_racket_data():
+    """Read the racket data, preferring a valid parquet snapshot that is newer than the CSV"""
+    df = _read_parquet_snapshot()
+    if df is not None:
+        return df
+    
+    df = pd.read_csv(DATA_CSV, engine='pyarrow', dtype=COLUMN_DTYPES)
+    # Snapshot so later cold starts hit the columnar path
+    _write_parquet_snapshot(df)
+    return df
 
 @st.cache_data
 def load_data():
-    """Load and prepare the padel racket data"""
+    """Load and prepare the padel racket data along with per-column (min, max) stats"""
     try:
-        df = pd.read_csv('padel_data.csv')
-        return df
+        df = read_racket_data()
     except FileNotFoundError:
         st.error("Please upload the padel_data.csv file to use this app")
-        return None
+        return None, None
+    
+    stats = {col: (int(df[col].min()), int(df[col].max())) for col in RATING_COLUMNS}
+    price_valid = df['price'].dropna()
+    stats['price'] = (int(price_valid.min()), int(price_valid.max())) if not price_valid.empty else None
+    return df, stats
+
+STAT_LABELS = [
+    ('Power', 'power'),
+    ('Control', 'control'),
+    ('Rebound', 'rebound'),
+    ('Omgang', 'omgang'),
+    ('Sweet Spot', 'sweetspot'),
+]
 
 def create_price_display(price):
-    """Create price display handling missing values"""
-    if pd.isna(price) or price is None:
-        return '<div class="price-unavailable">Price not available</div>'
-    else:
-        return f'<div class="price-tag">€{price:.0f}</div>'
+    """Create price display for a price column, handling missing values"""
+    price_tag = '<div class="price-tag">€' + price.round().astype('Int32').astype(str) + '</div>'
+    return pd.Series(
+        np.where(price.isna(), '<div class="price-unavailable">Price not available</div>', price_tag),
+        index=price.index
+    )
 
-def create_racket_card(racket):
-    """Create HTML for a single racket card"""
-    price_html = create_price_display(racket['price'])
-    
-    return f"""
-    <div class="racket-card">
-        <div class="racket-name">{racket['name']}</div>
-        <div class="overall-rating">Overall: {racket['overall']}</div>
-        {price_html}
-        <div class="stat-row">
-            <span class="stat-label">Power:</span>
-            <span class="stat-value">{racket['power']}</span>
-        </div>
-        <div class="stat-row">
-            <span class="stat-label">Control:</span>
-            <span class="stat-value">{racket['control']}</span>
-        </div>
-        <div class="stat-row">
-            <span class="stat-label">Rebound:</span>
-            <span class="stat-value">{racket['rebound']}</span>
-        </div>
-        <div class="stat-row">
-            <span class="stat-label">Omgang:</span>
-            <span class="stat-value">{racket['omgang']}</span>
-        </div>
-        <div class="stat-row">
-            <span class="stat-label">Sweet Spot:</span>
-            <span class="stat-value">{racket['sweetspot']}</span>
-        </div>
-    </div>
-    """
+def create_racket_cards(df):
+    """Create HTML for every racket card in a single vectorized pass"""
+    cards = (
+        '<div class="racket-card">'
+        '<div class="racket-name">' + df['name'].astype(str) + '</div>'
+        '<div class="overall-rating">Overall: ' + df['overall'].astype(str) + '</div>'
+        + create_price_display(df['price'])
+    )
+    for label, col in STAT_LABELS:
+        cards = cards + (
+            f'<div class="stat-row"><span class="stat-label">{label}:</span>'
+            '<span class="stat-value">' + df[col].astype(str) + '</span></div>'
+        )
+    return cards + '</div>'
+
+class Filters(NamedTuple):
+    """Immutable snapshot of the filter widgets"""
+    name_search: str
+    overall_range: Tuple[int, int]
+    price_range: Optional[Tuple[int, int]]
+    include_no_price: bool
+    power_range: Tuple[int, int]
+    control_range: Tuple[int, int]
+    rebound_range: Tuple[int, int]
+    omgang_range: Tuple[int, int]
+    sweetspot_range: Tuple[int, int]
 
-def filter_and_sort_data(df, filters, sort_by, sort_order):
-    """Apply filters and sorting to the dataframe"""
-    filtered_df = df.copy()
+def build_range_mask(df, stats, filters: Filters):
+    """Build the combined rating/price mask, skipping ranges left at their global bounds"""
+    mask = np.ones(len(df), dtype=bool)
     
-    # Apply filters
-    if filters['overall_range'][0] != filters['overall_range'][1]:
-        filtered_df = filtered_df[
-            (filtered_df['overall'] >= filters['overall_range'][0]) &
-            (filtered_df['overall'] <= filters['overall_range'][1])
-        ]
+    for attr in RATING_COLUMNS:
+        attr_range = getattr(filters, f'{attr}_range')
+        if attr_range != stats[attr]:
+            attr_arr = df[attr].values
+            mask &= (attr_arr >= attr_range[0]) & (attr_arr <= attr_range[1])
     
-    if filters['price_range'] and filters['price_range'][0] != filters['price_range'][1]:
+    price_arr = df['price'].values
+    if filters.price_range and filters.price_range != stats['price']:
         # For price filtering, handle NaN values
-        price_mask = (
-            (filtered_df['price'] >= filters['price_range'][0]) &
-            (filtered_df['price'] <= filters['price_range'][1])
-        ) | (filters['include_no_price'] & pd.isna(filtered_df['price']))
-        filtered_df = filtered_df[price_mask]
-    elif not filters['include_no_price']:
-        filtered_df = filtered_df[~pd.isna(filtered_df['price'])]
+        price_mask = (price_arr >= filters.price_range[0]) & (price_arr <= filters.price_range[1])
+        if filters.include_no_price:
+            price_mask |= np.isnan(price_arr)
+        mask &= price_mask
+    elif not filters.include_no_price:
+        mask &= ~np.isnan(price_arr)
     
-    # Apply attribute filters
-    for attr in ['power', 'control', 'rebound', 'omgang', 'sweetspot']:
-        attr_range = filters[f'{attr}_range']
-        if attr_range[0] != attr_range[1]:
-            filtered_df = filtered_df[
-                (filtered_df[attr] >= attr_range[0]) &
-                (filtered_df[attr] <= attr_range[1])
-            ]
+    return mask
+
+def filter_data(df, stats, filters: Filters):
+    """Apply filters to the dataframe"""
+    # Build one combined mask against the original frame and index once
+    mask = build_range_mask(df, stats, filters)
     
     # Apply name filter
-    if filters['name_search']:
-        filtered_df = filtered_df[
-            filtered_df['name'].str.contains(filters['name_search'], case=False, na=False)
-        ]
-    
-    # Apply sorting
-    if sort_by == 'price':
-        # Handle NaN values in price sorting
-        if sort_order == 'asc':
-            filtered_df = filtered_df.sort_values('price', na_position='last')
-        else:
-            filtered_df = filtered_df.sort_values('price', ascending=False, na_position='last')
-    else:
-        ascending = sort_order == 'asc'
-        filtered_df = filtered_df.sort_values(sort_by, ascending=ascending)
+    if filters.name_search:
+        # Plain substring match on the arrow-backed column runs in Arrow's compute kernel
+        name_match = df['name'].str.contains(filters.name_search, case=False, regex=False, na=False)
+        mask &= name_match.to_numpy(dtype=bool, na_value=False)
     
-    return filtered_df
+    return df[mask]
 
-def main():
-    st.title("🎾 Padel Racket Explorer")
-    st.markdown("Find your perfect padel racket from our comprehensive database")
+def sort_data(filtered_df, sort_by, sort_order, limit=None):
+    """Sort the filtered dataframe, returning only the first `limit` rows when given
     
-    # Load data
-    df = load_data()
-    if df is None:
-        return
+    Ties are always broken by row position, so every `limit` yields a prefix of the
+    same total order and consecutive pages never overlap or skip rackets.
+    """
+    ascending = sort_order == 'asc'
+    
+    if sort_by == 'name':
+        # Stable sort keeps tied names in row order
+        sorted_df = filtered_df.sort_values('name', ascending=ascending, kind='stable')
+        return sorted_df if limit is None else sorted_df.iloc[:limit]
+    
+    key = filtered_df[sort_by].to_numpy(dtype=np.float64, copy=True)
+    if not ascending:
+        key = -key
+    # Missing prices always go last, whichever the order
+    key[np.isnan(key)] = np.inf
+    
+    if limit is not None and len(key) > limit * 4:
+        # Partial sort: everything strictly below the kth key, plus the first tied rows by position
+        kth = np.partition(key, limit - 1)[limit - 1]
+        below = np.flatnonzero(key < kth)
+        tied = np.flatnonzero(key == kth)[:limit - len(below)]
+        positions = np.concatenate([below, tied])
+    else:
+        positions = np.arange(len(key))
     
+    # lexsort orders by key, then by position for ties
+    order = positions[np.lexsort((positions, key[positions]))]
+    if limit is not None:
+        order = order[:limit]
+    return filtered_df.iloc[order]
+
+@st.fragment
+def render_explorer(df, stats):
+    """Render filters, summary and results; slider changes rerun only this fragment"""
     # Sidebar filters
     with st.container():
         st.markdown('<div class="filter-section">', unsafe_allow_html=True)
@@ -196,21 +298,20 @@ def main():
             name_search = st.text_input("Search by name", placeholder="Enter racket name...")
             overall_range = st.slider(
                 "Overall Rating", 
-                min_value=int(df['overall'].min()), 
-                max_value=int(df['overall'].max()), 
-                value=(int(df['overall'].min()), int(df['overall'].max()))
+                min_value=stats['overall'][0], 
+                max_value=stats['overall'][1], 
+                value=stats['overall']
             )
         
         with col2:
             st.markdown("**Price Range**")
-            # Get price statistics excluding NaN values
-            price_data = df['price'].dropna()
-            if not price_data.empty:
+            # Price statistics exclude NaN values and are None when no racket has a price
+            if stats['price'] is not None:
                 price_range = st.slider(
                     "Price (€)", 
-                    min_value=int(price_data.min()), 
-                    max_value=int(price_data.max()), 
-                    value=(int(price_data.min()), int(price_data.max()))
+                    min_value=stats['price'][0], 
+                    max_value=stats['price'][1], 
+                    value=stats['price']
                 )
             else:
                 price_range = None
@@ -221,36 +322,36 @@ def main():
             st.markdown("**Performance Attributes**")
             power_range = st.slider(
                 "Power", 
-                min_value=int(df['power'].min()), 
-                max_value=int(df['power'].max()), 
-                value=(int(df['power'].min()), int(df['power'].max()))
+                min_value=stats['power'][0], 
+                max_value=stats['power'][1], 
+                value=stats['power']
             )
             control_range = st.slider(
                 "Control", 
-                min_value=int(df['control'].min()), 
-                max_value=int(df['control'].max()), 
-                value=(int(df['control'].min()), int(df['control'].max()))
+                min_value=stats['control'][0], 
+                max_value=stats['control'][1], 
+                value=stats['control']
             )
             rebound_range = st.slider(
                 "Rebound", 
-                min_value=int(df['rebound'].min()), 
-                max_value=int(df['rebound'].max()), 
-                value=(int(df['rebound'].min()), int(df['rebound'].max()))
+                min_value=stats['rebound'][0], 
+                max_value=stats['rebound'][1], 
+                value=stats['rebound']
             )
         
         with col4:
             st.markdown("**More Attributes & Sorting**")
             omgang_range = st.slider(
                 "Omgang", 
-                min_value=int(df['omgang'].min()), 
-                max_value=int(df['omgang'].max()), 
-                value=(int(df['omgang'].min()), int(df['omgang'].max()))
+                min_value=stats['omgang'][0], 
+                max_value=stats['omgang'][1], 
+                value=stats['omgang']
             )
             sweetspot_range = st.slider(
                 "Sweet Spot", 
-                min_value=int(df['sweetspot'].min()), 
-                max_value=int(df['sweetspot'].max()), 
-                value=(int(df['sweetspot'].min()), int(df['sweetspot'].max()))
+                min_value=stats['sweetspot'][0], 
+                max_value=stats['sweetspot'][1], 
+                value=stats['sweetspot']
             )
             
             st.markdown("**Sort by:**")
@@ -263,28 +364,32 @@ def main():
         
         st.markdown('</div>', unsafe_allow_html=True)
     
-    # Prepare filters dictionary
-    filters = {
-        'name_search': name_search,
-        'overall_range': overall_range,
-        'price_range': price_range,
-        'include_no_price': include_no_price,
-        'power_range': power_range,
-        'control_range': control_range,
-        'rebound_range': rebound_range,
-        'omgang_range': omgang_range,
-        'sweetspot_range': sweetspot_range
-    }
+    # Prepare hashable filter state
+    filters = Filters(
+        name_search=name_search,
+        overall_range=tuple(overall_range),
+        price_range=tuple(price_range) if price_range else None,
+        include_no_price=include_no_price,
+        power_range=tuple(power_range),
+        control_range=tuple(control_range),
+        rebound_range=tuple(rebound_range),
+        omgang_range=tuple(omgang_range),
+        sweetspot_range=tuple(sweetspot_range)
+    )
     
-    # Filter and sort data
-    filtered_df = filter_and_sort_data(df, filters, sort_by, sort_order)
+    # Filter data; sorting is deferred until we know how many rows are displayed
+    filtered_df = filter_data(df, stats, filters)
     
     # Display results summary
     st.markdown("---")
     total_rackets = len(df)
     shown_rackets = len(filtered_df)
-    rackets_with_price = len(filtered_df[~pd.isna(filtered_df['price'])])
-    rackets_without_price = len(filtered_df[pd.isna(filtered_df['price'])])
+    # Single pass over the price column feeds all price metrics
+    price_arr = filtered_df['price'].values
+    has_price = ~np.isnan(price_arr)
+    rackets_with_price = int(has_price.sum())
+    rackets_without_price = shown_rackets - rackets_with_price
+    avg_price = price_arr[has_price].mean(dtype=np.float64) if rackets_with_price else np.nan
     
     col1, col2, col3, col4 = st.columns(4)
     with col1:
@@ -295,8 +400,7 @@ def main():
         st.metric("Without Price", f"{rackets_without_price:,}")
     with col4:
         if shown_rackets > 0:
-            avg_price = filtered_df['price'].mean()
-            if not pd.isna(avg_price):
+            if not np.isnan(avg_price):
                 st.metric("Avg Price", f"€{avg_price:.0f}")
             else:
                 st.metric("Avg Price", "N/A")
@@ -308,18 +412,37 @@ def main():
         st.markdown("---")
         st.subheader(f"🎾 Rackets ({shown_rackets} found)")
         
-        # Create grid layout
-        cols_per_row = 3
-        rows = (len(filtered_df) + cols_per_row - 1) // cols_per_row
+        table_view = st.checkbox("Show as table", value=False)
+        if table_view:
+            # Built-in virtualized table only ships visible rows to the browser
+            st.dataframe(
+                sort_data(filtered_df, sort_by, sort_order),
+                use_container_width=True,
+                hide_index=True
+            )
+            return
+        
+        # Paginate so render cost scales with the page, not the whole catalog
+        max_pages = (shown_rackets + PAGE_SIZE - 1) // PAGE_SIZE
+        page = st.number_input("Page", min_value=1, max_value=max_pages, value=1, step=1)
+        st.caption(f"Page {page} of {max_pages}")
+        page_df = sort_data(filtered_df, sort_by, sort_order, limit=page * PAGE_SIZE).iloc[(page - 1) * PAGE_SIZE:]
         
-        for row in range(rows):
-            cols = st.columns(cols_per_row)
-            for col_idx in range(cols_per_row):
-                racket_idx = row * cols_per_row + col_idx
-                if racket_idx < len(filtered_df):
-                    racket = filtered_df.iloc[racket_idx]
-                    with cols[col_idx]:
-                        st.markdown(create_racket_card(racket), unsafe_allow_html=True)
+        # Create grid layout as a single CSS grid in one markdown message
+        cards = create_racket_cards(page_df).tolist()
+        st.markdown(f'<div class="racket-grid">{"".join(cards)}</div>', unsafe_allow_html=True)
+
+def main():
+    inject_css()
+    st.title("🎾 Padel Racket Explorer")
+    st.markdown("Find your perfect padel racket from our comprehensive database")
+    
+    # Load data
+    df, stats = load_data()
+    if df is None:
+        return
+    
+    render_explorer(df, stats)
 
 if __name__ == "__main__":
     main()